@@ -1,4 +1,6 @@
-from typing import List, Optional
+from functools import lru_cache
+from itertools import chain
+from typing import List, Optional, Sequence, Tuple
 
 from docutils import nodes
 from docutils.parsers.rst import directives
@@ -24,6 +26,28 @@ DIRECTIVE_NAME_GRID = "grid"
 DIRECTIVE_NAME_GRID_ITEM = "grid-item"
 DIRECTIVE_NAME_GRID_ITEM_CARD = "grid-item-card"
 
+# container-fluid is 100% width for all breakpoints,
+# rather than the fixed width of the breakpoint (like container)
+_GRID_PREFIX = ("sd-container-fluid", "sd-sphinx-override")
+_ITEM_PREFIX = ("sd-col",)
+_DEFAULT_MB4 = ("sd-mb-4",)
+_EMPTY: Tuple[str, ...] = ()
+_OUTLINE_ON = ("sd-border-1",)
+
+# error messages for each (allow_auto, min_num, max_num) used by the media options
+_ERR_MSGS = {
+    (allow_auto, min_num, max_num): (
+        "argument must be 1 or 4 (xs sm md lg) values, and each value should be "
+        f"{'either auto or ' if allow_auto else ''}an integer from {min_num} to {max_num}"
+    )
+    for allow_auto, min_num, max_num in ((False, 1, 12), (True, 1, 12), (False, 0, 5))
+}
+# allowed integer values for each (min_num, max_num) used by the media options
+_VALID_VALUES = {
+    (min_num, max_num): frozenset(str(i) for i in range(min_num, max_num + 1))
+    for min_num, max_num in ((1, 12), (0, 5))
+}
+
 
 def setup_grids(app: Sphinx):
     """Setup the grid components."""
@@ -44,30 +68,53 @@ def _media_option(
 
     One or four integers (for "xs sm md lg") between 1 and 12.
     """
-    validate_error_msg = (
-        "argument must be 1 or 4 (xs sm md lg) values, and each value should be "
-        f"{'either auto or ' if allow_auto else ''}an integer from {min_num} to {max_num}"
-    )
     if argument is None:
-        raise ValueError(validate_error_msg)
-    values = argument.strip().split()
-    if len(values) == 1:
-        values = [values[0], values[0], values[0], values[0]]
-    if len(values) != 4:
-        raise ValueError(validate_error_msg)
+        raise ValueError(_ERR_MSGS[(allow_auto, min_num, max_num)])
+    return list(_media_option_cached(argument, prefix, allow_auto, min_num, max_num))
+
+
+@lru_cache(maxsize=256)
+def _media_option_cached(
+    argument: str, prefix: str, allow_auto: bool, min_num: int, max_num: int
+) -> Tuple[str, ...]:
+    """Validate and convert a media option to its classes.
+
+    The result is cached, since the same few option strings recur across a project.
+    """
+    validate_error_msg = _ERR_MSGS[(allow_auto, min_num, max_num)]
+    argument = argument.strip()
+    if argument.isalnum():
+        # a single value (the common case), which cannot contain whitespace
+        values: Sequence[str] = (argument, argument, argument, argument)
+    else:
+        values = argument.split()
+        if len(values) == 1:
+            values = [values[0], values[0], values[0], values[0]]
+        if len(values) != 4:
+            raise ValueError(validate_error_msg)
+    valid = _VALID_VALUES[(min_num, max_num)]
     for value in values:
         if allow_auto and value == "auto":
             continue
-        try:
-            int_value = int(value)
-        except Exception:
-            raise ValueError(validate_error_msg)
-        if not (min_num <= int_value <= max_num):
+        if value not in valid:
             raise ValueError(validate_error_msg)
-    return [f"{prefix}{values[0]}"] + [
-        f"{prefix}{size}-{value}"
-        for size, value in zip(["xs", "sm", "md", "lg"], values)
-    ]
+    return _build_classes(prefix, *values)
+
+
+@lru_cache(maxsize=512)
+def _build_classes(prefix: str, v0: str, v1: str, v2: str, v3: str) -> Tuple[str, ...]:
+    """Create the classes for validated (xs sm md lg) values.
+
+    Cached separately, so that equivalent arguments (e.g. ``3`` and ``3 3 3 3``)
+    share a single result.
+    """
+    return (
+        f"{prefix}{v0}",
+        f"{prefix}xs-{v0}",
+        f"{prefix}sm-{v1}",
+        f"{prefix}md-{v2}",
+        f"{prefix}lg-{v3}",
+    )
 
 
 def row_columns_option(argument: Optional[str]) -> List[str]:
@@ -113,50 +160,63 @@ class GridDirective(SphinxDirective):
 
     def run(self) -> List[nodes.Node]:
         """Run the directive."""
+        options = self.options
+        get = options.get
         try:
             column_classes = (
-                row_columns_option(self.arguments[0]) if self.arguments else []
+                row_columns_option(self.arguments[0]) if self.arguments else _EMPTY
             )
         except ValueError as exc:
             raise self.error(f"Invalid directive argument: {exc}")
         self.assert_has_content()
-        # container-fluid is 100% width for all breakpoints,
-        # rather than the fixed width of the breakpoint (like container)
-        grid_classes = ["sd-container-fluid", "sd-sphinx-override"]
         container = create_component(
             "grid-container",
-            grid_classes
-            + self.options.get("margin", ["sd-mb-4"])
-            + self.options.get("padding", [])
-            + (["sd-border-1"] if "outline" in self.options else [])
-            + self.options.get("class-container", []),
+            chain(
+                _GRID_PREFIX,
+                get("margin", _DEFAULT_MB4),
+                get("padding", _EMPTY),
+                _OUTLINE_ON if "outline" in options else _EMPTY,
+                get("class-container", _EMPTY),
+            ),
         )
         self.set_source_info(container)
         row = create_component(
             "grid-row",
-            ["sd-row"]
-            + column_classes
-            + self.options.get("gutter", [])
-            + (["sd-flex-row-reverse"] if "reverse" in self.options else [])
-            + self.options.get("class-row", []),
+            chain(
+                ("sd-row",),
+                column_classes,
+                get("gutter", _EMPTY),
+                ("sd-flex-row-reverse",) if "reverse" in options else (),
+                get("class-row", _EMPTY),
+            ),
         )
         self.set_source_info(row)
         container += row
         self.state.nested_parse(self.content, self.content_offset, row)
         # each item in a row should be a column
-        for item in row.children:
-            if not is_component(item, "grid-item"):
-                LOGGER.warning(
-                    f"All children of a 'grid-row' "
-                    f"should be 'grid-item' [{WARNING_TYPE}.grid]",
-                    location=item,
-                    type=WARNING_TYPE,
-                    subtype="grid",
-                )
-                break
+        invalid = next(
+            (item for item in row.children if not is_component(item, "grid-item")),
+            None,
+        )
+        if invalid is not None:
+            LOGGER.warning(
+                f"All children of a 'grid-row' "
+                f"should be 'grid-item' [{WARNING_TYPE}.grid]",
+                location=invalid,
+                type=WARNING_TYPE,
+                subtype="grid",
+            )
         return [container]
 
 
+# options shared by GridItemDirective and GridItemCardDirective
+_COMMON_ITEM_OPTS = {
+    "columns": item_columns_option,
+    "margin": margin_option,
+    "padding": padding_option,
+}
+
+
 class GridItemDirective(SphinxDirective):
     """An item within a grid row.
 
@@ -165,9 +225,7 @@ class GridItemDirective(SphinxDirective):
 
     has_content = True
     option_spec = {
-        "columns": item_columns_option,
-        "margin": margin_option,
-        "padding": padding_option,
+        **_COMMON_ITEM_OPTS,
         "child-direction": make_choice(["column", "row"]),
         "child-align": make_choice(["start", "end", "center", "justify", "spaced"]),
         "outline": directives.flag,
@@ -176,6 +234,8 @@ class GridItemDirective(SphinxDirective):
 
     def run(self) -> List[nodes.Node]:
         """Run the directive."""
+        options = self.options
+        get = options.get
         if not is_component(self.state_machine.node, "grid-row"):
             LOGGER.warning(
                 f"The parent of a 'grid-item' should be a 'grid-row' [{WARNING_TYPE}.grid]",
@@ -185,26 +245,50 @@ class GridItemDirective(SphinxDirective):
             )
         column = create_component(
             "grid-item",
-            [
-                "sd-col",
-                f"sd-d-flex-{self.options.get('child-direction', 'column')}",
-            ]
-            + self.options.get("columns", [])
-            + self.options.get("margin", [])
-            + self.options.get("padding", [])
-            + (
-                [f'sd-align-major-{self.options["child-align"]}']
-                if "child-align" in self.options
-                else []
-            )
-            + (["sd-border-1"] if "outline" in self.options else [])
-            + self.options.get("class", []),
+            chain(
+                _ITEM_PREFIX,
+                (f"sd-d-flex-{get('child-direction', 'column')}",),
+                get("columns", _EMPTY),
+                get("margin", _EMPTY),
+                get("padding", _EMPTY),
+                (
+                    (f'sd-align-major-{options["child-align"]}',)
+                    if "child-align" in options
+                    else ()
+                ),
+                _OUTLINE_ON if "outline" in options else _EMPTY,
+                get("class", _EMPTY),
+            ),
         )
         self.set_source_info(column)
         self.state.nested_parse(self.content, self.content_offset, column)
         return [column]
 
 
+# options of GridItemCardDirective which are passed through to the card
+_CARD_OPTION_KEYS = frozenset(
+    (
+        "width",
+        "text-align",
+        "img-background",
+        "img-top",
+        "img-bottom",
+        "img-alt",
+        "link",
+        "link-type",
+        "link-alt",
+        "shadow",
+        "class-card",
+        "class-body",
+        "class-title",
+        "class-header",
+        "class-footer",
+        "class-img-top",
+        "class-img-bottom",
+    )
+)
+
+
 class GridItemCardDirective(SphinxDirective):
     """An item within a grid row, with an internal card."""
 
@@ -213,9 +297,7 @@ class GridItemCardDirective(SphinxDirective):
     optional_arguments = 1  # card title
     final_argument_whitespace = True
     option_spec = {
-        "columns": item_columns_option,
-        "margin": margin_option,
-        "padding": padding_option,
+        **_COMMON_ITEM_OPTS,
         "class-item": directives.class_option,
         # The options below must be sync'ed with CardDirective.option_spec (minus margin).
         "width": make_choice(["auto", "25%", "50%", "75%", "100%"]),
@@ -239,6 +321,8 @@ class GridItemCardDirective(SphinxDirective):
 
     def run(self) -> List[nodes.Node]:
         """Run the directive."""
+        options = self.options
+        get = options.get
         if not is_component(self.state_machine.node, "grid-row"):
             LOGGER.warning(
                 f"The parent of a 'grid-item' should be a 'grid-row' [{WARNING_TYPE}.grid]",
@@ -248,39 +332,16 @@ class GridItemCardDirective(SphinxDirective):
             )
         column = create_component(
             "grid-item",
-            [
-                "sd-col",
-                "sd-d-flex-row",
-            ]
-            + self.options.get("columns", [])
-            + self.options.get("margin", [])
-            + self.options.get("padding", [])
-            + self.options.get("class-item", []),
+            chain(
+                _ITEM_PREFIX,
+                ("sd-d-flex-row",),
+                get("columns", _EMPTY),
+                get("margin", _EMPTY),
+                get("padding", _EMPTY),
+                get("class-item", _EMPTY),
+            ),
         )
-        card_options = {
-            key: value
-            for key, value in self.options.items()
-            if key
-            in [
-                "width",
-                "text-align",
-                "img-background",
-                "img-top",
-                "img-bottom",
-                "img-alt",
-                "link",
-                "link-type",
-                "link-alt",
-                "shadow",
-                "class-card",
-                "class-body",
-                "class-title",
-                "class-header",
-                "class-footer",
-                "class-img-top",
-                "class-img-bottom",
-            ]
-        }
+        card_options = {key: options[key] for key in options.keys() & _CARD_OPTION_KEYS}
         if "width" not in card_options:
             card_options["width"] = "100%"
         card_options["margin"] = []
@@ -1,6 +1,6 @@
 """Shared constants and functions."""
 
-from typing import List, Optional, Sequence
+from typing import Iterable, List, Optional, Sequence
 
 from docutils import nodes
 from docutils.parsers.rst import directives
@@ -24,7 +24,7 @@ SEMANTIC_COLORS = (
 
 def create_component(
     name: str,
-    classes: Sequence[str] = (),
+    classes: Iterable[str] = (),
     *,
     rawtext: str = "",
     children: Sequence[nodes.Node] = (),